@@ -7,40 +7,66 @@ MBWhitestone, 2021.
 """
 
 import os
+import re
+import pickle
 import logging
 import asyncio
 import argparse
 
 import arxiv
+import aiohttp
 import discord as dc
 
 from zlib import adler32
 from ruamel.yaml import YAML
 
+# Maps \n and \t to a space, see chop_str.
+_WHITESPACE_TABLE = str.maketrans('\n\t', '  ')
+# Two digits, any separator and two digits, see is_msc.
+_MSC_RE = re.compile(r'\d{2}.\d{2}', re.DOTALL)
 
-async def get_papers(cat, q, sort_by, n=3, iterative=True):
+
+async def get_papers(cat, q, sort_by, n=3, client=None):
     """Retrieve papers from arXiv.
 
+    The blocking arXiv request runs in a separate thread, so the event loop
+    (and thereby the bot) stays responsive in the meantime.
+
     Args:
         cat (str): arXiv category
         q (str): query
-        sort_by (str, optional): sorting order.
+        sort_by (arxiv.SortCriterion): sorting order.
         n (int, optional): number of results. Defaults to 3.
-        iterative (bool, optional): make iterator. Defaults to False.
+        client (arxiv.Client, optional): client to use, its delay between
+            requests only holds for requests made one at a time. Defaults to
+            a new client.
 
     Returns:
-        list / iterator: container with hashmap for each paper.
+        list: container with hashmap for each paper.
     """
-    return arxiv.Search(query=f"cat:{cat} AND all:{q}",
-                        sort_by=arxiv.arxiv.SortCriterion[sort_by],
-                        max_results=n).get()
+    client = arxiv.Client() if client is None else client
+    search = arxiv.Search(query=f"cat:{cat} AND all:{q}", sort_by=sort_by,
+                          max_results=n)
+    return await asyncio.to_thread(lambda: list(client.get(search)))
+
+
+def is_transient(error):
+    """Returns whether error (Exception) of sending a message may go away."""
+    if isinstance(error, dc.HTTPException):
+        return error.status >= 500
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
+
+def get_paper_id(paper):
+    """Returns the arXiv id (str) of paper, including its version."""
+    return paper.entry_id.split('/')[-1]
 
 
 async def get_channel(client, channel):
     """Return channel as Discord object.
 
     Args:
-        client (dc.Client): Discord Client object.
+        client (arΧivBot): Discord Client object with a channel cache.
         channel (str, optional): Channel name.
 
     Raises:
@@ -49,18 +75,33 @@ async def get_channel(client, channel):
     Returns:
         dc channel object: discord channel
     """
-    for c in client.get_all_channels():
-        if c.name == channel:
-            return c
-    raise ValueError(f'Unknown channel {channel}')
+    try:
+        return client.channel_cache[channel]
+    except KeyError:
+        raise ValueError(f'Unknown channel {channel}') from None
 
 
-async def chop_str(to_chop, chop=1024, remove_whitespace=True):
+def chop_str(to_chop, chop=1024, remove_whitespace=True):
     """Chop a string at maximum length chop, optionally remove \n ∧ \t."""
     if remove_whitespace:
-        to_chop = to_chop.replace('\n', ' ').replace('\t', ' ')
-    s = to_chop[:chop - 1] + '…' if len(to_chop) > chop else to_chop
-    return s
+        to_chop = to_chop.translate(_WHITESPACE_TABLE)
+    if len(to_chop) <= chop:
+        return to_chop
+    return to_chop[:chop - 1] + '…'
+
+
+def chop_join(to_join, chop=1024, sep=', '):
+    """Join strings with sep like chop_str(sep.join(to_join), chop, False).
+
+    Stops joining as soon as the maximum length chop is exceeded.
+    """
+    parts, length = [], -len(sep)
+    for s in to_join:
+        length += len(sep) + len(s)
+        if length > chop:
+            return chop_str(sep.join(parts + [s]), chop, False)
+        parts.append(s)
+    return sep.join(parts)
 
 
 async def embed_paper(paper, summary_len, color):
@@ -72,70 +113,99 @@ async def embed_paper(paper, summary_len, color):
     Args:
         paper (dict): arXiv API paper.
         summary_len (int, optional): maximum length of summary.
-        color (hex, optional): message color, if None based on query.
+        color (hex): message color.
 
     Returns:
         dc.Embed: Discord embedding.
     """
-    # Base color on category and query when not specified.
-    if color is None:
-        color = adler32(bytes(paper.comment, 'utf-8')) % 0xffffff
-
-    emb = dc.Embed(title=await chop_str(paper.title, 256),
-                   description=await chop_str(paper.summary, summary_len),
+    emb = dc.Embed(title=chop_str(paper.title, 256),
+                   description=chop_str(paper.summary, summary_len),
                    type="rich",
-                   url=await chop_str(paper.pdf_url),
+                   url=chop_str(paper.pdf_url),
                    timestamp=paper.updated,
                    color=color)
-    emb.set_footer(text=await chop_str(paper.comment))
-    emb.set_author(name=await chop_str(', '.join(map(str, paper.authors)),
-                                       256))
+    emb.set_footer(text=chop_str(paper.comment))
+    authors = ', '.join(a.name for a in paper.authors)
+    emb.set_author(name=chop_str(authors, 256))
     return emb
 
 
-async def is_valid_category(category):
+def is_valid_category(category):
     """Returns whether category (str) is a valid arXiv category."""
-    return await is_acm(category) or await is_msc(category)
+    return is_acm(category) or is_msc(category)
 
 
-async def is_msc(msc):
+def is_msc(msc):
     """Returns whether msc is a valid msc category.
 
     See also:
     https://mathscinet.ams.org/mathscinet/msc/pdfs/classifications2020.pdf
     """
-    return len(msc) == 5 and msc[:2].isdigit() and msc[3:5].isdigit()
+    return _MSC_RE.fullmatch(msc) is not None
 
 
-async def is_acm(acm):
+def is_acm(acm):
     """Returns whether acm (str) is a valid acm category."""
     return 1 < len(acm) < 6 and '.' in acm
 
 
+def _int_between(low, high=None):
+    """Returns a validator for integers in [low, high], high None for ∞."""
+    def validate(value):
+        if value.isdigit() and low <= int(value) and (high is None or
+                                                       int(value) <= high):
+            return True, int(value)
+        return False, value
+    return validate
+
+
+def _validate_sort_by(value):
+    """Returns whether value is a sort criterion and its normalized form."""
+    for o in ['relevance', 'lastUpdatedDate', 'submittedDate']:
+        if o.lower() == value.lower():
+            return True, o[0].capitalize() + o[1:]
+    return False, value
+
+
+def _validate_hotword(value):
+    """Returns whether value is a valid hotword and its normalized form."""
+    return 2 < len(value) < 16, value.lower()
+
+
+# Validators for the parameters which can be set, see arΧivBot._set. A
+# validator returns whether its str argument is valid and the value to store.
+_SET_VALIDATORS = {
+    "summary_length": _int_between(1, 2048),
+    "n_query": _int_between(1, 999),
+    "sort_by": _validate_sort_by,
+    "message_color": _int_between(1),
+    "query_interval": _int_between(30, 5999999),
+    "hotword": _validate_hotword,
+}
+
+
 def transform_config(cfg, split_1='search:', split_2='known_papers:'):
     """Ugly function to make cfg.yml less ugly."""
     before_search, after_search = cfg.split(split_1, 1)
     search_default, papers_default = after_search.split(split_2, 1)
 
-    search, paper_comment = '', ''
+    search, paper_comment = [], ''
     for line in search_default.splitlines():
         line = line.strip()
         if line:
             if line.startswith('-'):
-                search += '  '
+                search.append('  ')
             elif line.startswith('# List of paper ids'):
                 paper_comment = line
                 continue
-            search += '  ' + line + '\n'
+            search.append('  ' + line + '\n')
+    search = ''.join(search)
 
     ok = papers_default
     if '-' in papers_default:
-        ok = ' ['
-        for line in papers_default.splitlines():
-            line = line.strip()
-            if '-' in line:
-                ok += line.split('- ')[1] + ', '
-        ok = ok[:-2] + ']'
+        papers = [line.strip().split('- ')[1]
+                  for line in papers_default.splitlines() if '-' in line]
+        ok = ' [' + ', '.join(papers) + ']'
 
     return f"{before_search}{split_1}\n{search}{paper_comment}\n{split_2}{ok}"
 
@@ -151,6 +221,7 @@ class arΧivBot(dc.Client):
         """
         dir_path = os.path.dirname(os.path.realpath(__file__))
         self.cfg_path = os.path.join(dir_path, cfg_file)
+        self.cache_path = self.cfg_path + '.pickle'
         self.yaml = YAML()
         # Some values to keep the .yml in shape.
         self.yaml.indent(mapping=15, sequence=4, offset=2)
@@ -170,25 +241,102 @@ class arΧivBot(dc.Client):
         self.cfg['hotword'] = self.cfg['hotword'].lower()
         self.cfg['sort_by'] = (self.cfg['sort_by'][0].capitalize() +
                                self.cfg['sort_by'][1:])
+        self._sort_by = arxiv.SortCriterion[self.cfg['sort_by']]
+        # Shared, so its delay between requests holds across searches.
+        self.arxiv_client = arxiv.Client()
+        # Set mirror of known_papers for fast membership tests.
+        self._known_set = set(self.cfg['known_papers'])
+        # Message colors per (category, query), see _query_color.
+        self._color_cache = {}
+        # Whether the configuration has changes not yet written to disk.
+        self._dirty = False
+        # Channel name to channel, see _cache_channels.
+        self.channel_cache = {}
+        # Whether on_ready started the background tasks.
+        self._tasks_started = False
 
         self.key = self._get_key()
-        self.prompts = ['add', 'del', 'set', 'list']
+        # Prompt: (handler, minimal #arguments, maximal #arguments or None).
+        self.prompts = {'add': (self._add, 2, None),
+                        'del': (self._del, 2, None),
+                        'set': (self._set, 2, 2),
+                        'list': (self._list, 0, None)}
         self.hidden_keys = ['search', 'key', 'known_papers']
         self.search_key = "search"
+        self._lc_categories = {k.lower() for k in self.cfg[self.search_key]}
+        self._rebuild_search_pairs()
 
         super().__init__()
 
+    def _rebuild_search_pairs(self):
+        """Flatten the search list to (category, query) pairs for polling.
+
+        A new list is assigned, so a poll iterating the old one is unaffected.
+        """
+        self._search_pairs = [(category, query) for category, queries
+                              in self.cfg[self.search_key].items()
+                              for query in queries]
+
     def _cfg_from_disk(self):
-        """Read and return configuration file from disk."""
+        """Read and return configuration file from disk.
+
+        The parsed configuration is cached as a pickle next to the YAML, which
+        is used instead of parsing the YAML as long as the modification time
+        and size of the YAML exactly match the ones stored with the cache.
+        """
+        try:
+            with open(self.cache_path, 'rb') as f:
+                stamp, cfg = pickle.load(f)
+            if stamp == self._cfg_stamp():
+                return cfg
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            # Only a cache, e.g. written by another ruamel.yaml version.
+            logging.warning(f'Ignoring configuration cache: {e!r}')
+
         with open(self.cfg_path, 'r') as f:
             cfg = self.yaml.load(f)
+        self._cache_to_disk(cfg)
         return cfg
 
+    def _cfg_stamp(self):
+        """Returns (modification time in ns, size) of the configuration."""
+        st = os.stat(self.cfg_path)
+        return st.st_mtime_ns, st.st_size
+
+    def _cache_to_disk(self, cfg):
+        """Write parsed configuration cfg to the pickle cache."""
+        try:
+            with open(self.cache_path, 'wb') as f:
+                pickle.dump((self._cfg_stamp(), cfg), f,
+                            pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            logging.warning(f'Could not cache configuration: {e}')
+
     async def _cfg_to_disk(self, default_flow_style=False):
-        """Write current configuration to disk."""
+        """Write current configuration (and its cache) to disk."""
         self.yaml.default_flow_style = default_flow_style
         with open(self.cfg_path, 'w') as f:
             self.yaml.dump(self.cfg, f, transform=transform_config)
+        self._cache_to_disk(self.cfg)
+        self._dirty = False
+
+    async def _flush_loop(self, delay=2):
+        """Write the configuration to disk every delay seconds if changed.
+
+        Commands only mark the configuration as dirty, so that a burst of
+        changes results in a single write.
+        """
+        await self.wait_until_ready()
+        while not self.is_closed():
+            await asyncio.sleep(delay)
+            if self._dirty:
+                try:
+                    await self._cfg_to_disk()
+                except OSError as e:
+                    # Still dirty, so the next iteration tries again.
+                    logging.error(f'Could not write configuration: {e}')
 
     def _get_key(self):
         """Return Discord bot key."""
@@ -208,7 +356,55 @@ class arΧivBot(dc.Client):
     async def on_ready(self):
         """Start the bot when ready."""
         logging.info(f'\n\tLogged in as {self.user.name} ({self.user.id})\n')
-        self.loop.create_task(self.check_arxiv())
+        self._cache_channels()
+        # on_ready runs again after every reconnect; start the tasks once.
+        if not self._tasks_started:
+            self._tasks_started = True
+            self.loop.create_task(self.check_arxiv())
+            self.loop.create_task(self._flush_loop())
+
+    def _cache_channels(self):
+        """Map the name of every channel the bot can see to the channel."""
+        self.channel_cache = {}
+        for c in self.get_all_channels():
+            # Keep the first channel with a name, like a linear search would.
+            self.channel_cache.setdefault(c.name, c)
+
+    async def on_guild_channel_create(self, channel):
+        """Update the channel cache for a new channel."""
+        self._cache_channels()
+
+    async def on_guild_channel_delete(self, channel):
+        """Update the channel cache for a deleted channel."""
+        self._cache_channels()
+
+    async def on_guild_channel_update(self, before, after):
+        """Update the channel cache for a changed channel."""
+        self._cache_channels()
+
+    async def on_guild_join(self, guild):
+        """Update the channel cache for the channels of a joined guild."""
+        self._cache_channels()
+
+    async def on_guild_remove(self, guild):
+        """Update the channel cache for the channels of a left guild."""
+        self._cache_channels()
+
+    async def on_guild_available(self, guild):
+        """Update the channel cache for the channels of an available guild."""
+        self._cache_channels()
+
+    async def on_guild_unavailable(self, guild):
+        """Update the channel cache for the channels of a lost guild."""
+        self._cache_channels()
+
+    async def close(self):
+        """Write pending configuration changes to disk and stop the bot."""
+        try:
+            if self._dirty:
+                await self._cfg_to_disk()
+        finally:
+            await super().close()
 
     async def on_message(self, message):
         """Defines what to do when a new message enters a Discord channel.
@@ -216,51 +412,80 @@ class arΧivBot(dc.Client):
         Args:
             message (str): Discord message.
         """
-        if not message.content.lower().startswith(self.cfg['hotword']):
+        hotword = self.cfg['hotword']
+        if message.content[:len(hotword)].lower() != hotword:
             return
 
-        logging.info(f'Got message {await chop_str(message.content)}')
+        logging.info(f'Got message {chop_str(message.content)}')
         channel = message.channel
-        content = message.content.split(" ")
-        n_content = len(content)
-        if n_content >= 2:
-            prompt = content[1].lower()
-
-            if prompt == self.prompts[0] and n_content >= 4:
-                await self._add(channel, *content[2:])
-            elif prompt == self.prompts[1] and n_content >= 4:
-                await self._del(channel, *content[2:])
-            elif prompt == self.prompts[2] and n_content == 4:
-                await self._set(channel, content[2], content[3])
-            elif prompt == self.prompts[3]:
-                await self._list(channel)
-            else:
-                await self._help(channel)
-        else:
-            await self._help(channel)
-
-    async def process_paper(self, channel, paper):
-        """Returns whether a new paper is processed.
-
-        Sends paper to Discord if not yet processed.
+        content = message.content.split(" ", 2)
+        if len(content) >= 2 and content[1].lower() in self.prompts:
+            handler, n_min, n_max = self.prompts[content[1].lower()]
+            # Split arguments only as far as needed, the last keeps spaces.
+            args = []
+            if len(content) == 3:
+                n_split = n_max if n_max is not None else max(n_min - 1, 0)
+                args = content[2].split(" ", n_split)
+            if n_min <= len(args) and (n_max is None or len(args) <= n_max):
+                await handler(channel, *args)
+                return
+        await self._help(channel)
+
+    async def process_paper(self, paper, summary_len, color):
+        """Returns the embedding of paper if it is not yet processed.
+
+        The paper is marked as known right away, so that it is sent only once
+        even if another query finds it while it is being sent. check_arxiv
+        unmarks it again if sending fails with a transient error.
 
         Args:
-            channel (dc.channel): Discord channel.
             paper (dict): arXiv paper information.
+            summary_len (int): maximum length of summary.
+            color (hex): message color.
 
         Returns:
-            bool: whether a new paper is processed.
+            dc.Embed: Discord embedding, None if the paper is already known.
         """
-        paper_id, new_paper = paper.entry_id.split('/')[-1], False
-        if paper_id not in self.cfg['known_papers']:
-            new_paper = True
-            logging.info(f'Got new paper {await chop_str(paper.title, 69)}')
-            emb = await embed_paper(paper, self.cfg['summary_length'],
-                                    self.cfg['message_color'])
-            await channel.send(embed=emb)
+        paper_id, emb = get_paper_id(paper), None
+        known = self._known_set
+        if paper_id not in known:
+            logging.info(f'Got new paper {chop_str(paper.title, 69)}')
+            emb = await embed_paper(paper, summary_len, color)
+            known.add(paper_id)
             self.cfg['known_papers'].append(paper_id)
 
-        return new_paper
+        return emb
+
+    async def _send(self, semaphore, channel, emb):
+        """Send embedding emb to channel, bounded by semaphore."""
+        async with semaphore:
+            await channel.send(embed=emb)
+
+    def _query_color(self, category, query):
+        """Returns the message color based on category and query."""
+        key = (category, query)
+        color = self._color_cache.get(key)
+        if color is None:
+            color = adler32(f'{category}: {query}'.encode('utf-8')) % 0xffffff
+            self._color_cache[key] = color
+        return color
+
+    async def _search(self, semaphore, category, query, sort_by, n):
+        """Returns the list of papers found on arXiv for category and query.
+
+        All searches share one arXiv client, which waits between requests as
+        arXiv asks, as long as semaphore lets only one search run at a time.
+
+        Args:
+            semaphore (asyncio.Semaphore): limits the concurrent requests.
+            category (str): arXiv category.
+            query (str): the actual query.
+            sort_by (arxiv.SortCriterion): sorting order.
+            n (int): number of results.
+        """
+        async with semaphore:
+            return await get_papers(cat=category, q=query, sort_by=sort_by,
+                                    n=n, client=self.arxiv_client)
 
     async def check_arxiv(self):
         """Main function to keep the bot informed on arXiv papers."""
@@ -268,23 +493,55 @@ class arΧivBot(dc.Client):
         channel = await get_channel(self, self.cfg['paper_channel'])
 
         while not self.is_closed():
-            new_paper = False
-            # Search for new papers.
-            for category, queries in self.cfg["search"].items():
-                for query in queries:
-                    papers = await get_papers(cat=category, q=query,
-                                              sort_by=self.cfg['sort_by'],
-                                              n=self.cfg['n_query'])
-                    for paper in papers:
-                        # Don't need the comment field; let's use it.
-                        paper.comment = category + ': ' + query
-                        if await self.process_paper(channel, paper):
-                            new_paper = True
-
-            if new_paper:
+            sort_by, n = self._sort_by, self.cfg['n_query']
+            summary_len = self.cfg['summary_length']
+            message_color = self.cfg['message_color']
+            interval = self.cfg['query_interval']
+
+            # Search for new papers. arXiv allows a single connection at a
+            # time, so the searches are queued rather than run concurrently.
+            searches = self._search_pairs
+            semaphore = asyncio.Semaphore(1)
+            results = await asyncio.gather(
+                *(self._search(semaphore, c, q, sort_by, n)
+                  for c, q in searches),
+                return_exceptions=True)
+
+            new_papers = []
+            for (category, query), papers in zip(searches, results):
+                if isinstance(papers, Exception):
+                    logging.warning(f'Search {category}: {query} failed: '
+                                    f'{papers}')
+                    continue
+                color = message_color
+                if color is None:
+                    # Base color on category and query when not specified.
+                    color = self._query_color(category, query)
+                for paper in papers:
+                    # Don't need the comment field; let's use it.
+                    paper.comment = category + ': ' + query
+                    emb = await self.process_paper(paper, summary_len, color)
+                    if emb is not None:
+                        new_papers.append((get_paper_id(paper), emb))
+
+            # Send the new papers concurrently, so their order may vary.
+            semaphore = asyncio.Semaphore(5)
+            sends = (self._send(semaphore, channel, emb)
+                     for _, emb in new_papers)
+            results = await asyncio.gather(*sends, return_exceptions=True)
+            for (paper_id, emb), result in zip(new_papers, results):
+                if not isinstance(result, Exception):
+                    continue
+                logging.warning(f'Sending {emb.title} failed: {result!r}')
+                if is_transient(result):
+                    # Forget the paper, so the next poll tries again.
+                    self._known_set.discard(paper_id)
+                    self.cfg['known_papers'].remove(paper_id)
+
+            if new_papers:
                 await self._cfg_to_disk()
-            logging.info(f"Sleeping {self.cfg['query_interval']} seconds now…")
-            await asyncio.sleep(self.cfg['query_interval'])
+            logging.info(f"Sleeping {interval} seconds now…")
+            await asyncio.sleep(interval)
 
     async def _add(self, channel, category, *query):
         """Add a search query to the search list.
@@ -294,20 +551,21 @@ class arΧivBot(dc.Client):
             category (str): Query arXiv category.
             query (list(str)): the actual query.
         """
-        if await is_valid_category(category):
-            keys = [k.lower() for k in self.cfg[self.search_key].keys()]
-            if category.lower() not in keys:
+        if is_valid_category(category):
+            if category.lower() not in self._lc_categories:
                 self.cfg[self.search_key][category] = []
+                self._lc_categories.add(category.lower())
                 await channel.send(f"Added {category} to the search list.")
 
             query = ' '.join(query)
             if query and query not in self.cfg[self.search_key][category]:
                 self.cfg[self.search_key][category].append(query)
+                self._rebuild_search_pairs()
                 m = f"Added {query} to the search for {category}."
             else:
                 m = f"Query {query} for **{category}** already known or empty."
             await channel.send(m)
-            await self._cfg_to_disk()
+            self._dirty = True
         else:
             await channel.send(f'{category} is not a valid arXiv category.')
 
@@ -319,7 +577,7 @@ class arΧivBot(dc.Client):
             category (str): Query arXiv category.
             query (list(str)): the actual query.
         """
-        if (await is_valid_category(category) and
+        if (is_valid_category(category) and
                 category in [k for k in self.cfg[self.search_key].keys()]):
             query = ' '.join(query)
             if query in self.cfg[self.search_key][category]:
@@ -327,12 +585,14 @@ class arΧivBot(dc.Client):
                 m = f"Query **{query}** "
                 if not self.cfg[self.search_key][category]:
                     del self.cfg[self.search_key][category]
+                    self._lc_categories.discard(category.lower())
                     m += f"and category **{category}** "
                 m += "removed from the search list."
+                self._rebuild_search_pairs()
             else:
                 m = f"Query **{category}: {query}** is not in the search."
             await channel.send(m)
-            await self._cfg_to_disk()
+            self._dirty = True
         else:
             m = f'Category **{category}** cannot be in the arXiv search list.'
             await channel.send(m)
@@ -352,55 +612,43 @@ class arΧivBot(dc.Client):
 
         valid = False
         if key == "paper_channel":
-            pot_channel = await get_channel(self, value)
-            if pot_channel is not None:
+            try:
+                await get_channel(self, value)
                 valid = True
-        elif (key == "summary_lenght" and value.isdigit() and
-              int(value) <= 2048):
-            valid, value = True, int(value)
-        elif key == "n_query" and value.isdigit() and 0 < int(value) < 1000:
-            valid, value = True, int(value)
-        elif key == "sort_by":
-            options = ['relevance', 'lastUpdatedDate', 'submittedDate']
-            for o in options:
-                if o.lower() == value.lower():
-                    valid = True
-                    value = o
-                    break
-        elif key == "message_color" and value.isdigit() and int(value) > 0:
-            valid, value = True, int(value)
-        elif (key == "query_interval" and value.isdigit() and
-              29 < int(value) < 6000000):
-            valid, value = True, int(value)
-        elif key == "hotword" and 2 < len(value) < 16:
-            valid, value = True, value.lower()
+            except ValueError:
+                pass
+        elif key in _SET_VALIDATORS:
+            valid, value = _SET_VALIDATORS[key](value)
 
         if valid:
             self.cfg[key] = value
-            await self._cfg_to_disk()
+            if key == "sort_by":
+                self._sort_by = arxiv.SortCriterion[value]
+            self._dirty = True
             await channel.send(f'Key **{key}** is set to value **{value}**.')
         else:
             await channel.send(f'Invalid option **{value}** for **{key}**.')
 
-    async def _list(self, channel):
+    async def _list(self, channel, *_):
         """Sends an overview of known papers and search queries to channel.
 
         Args:
             channel (discord.Message.channel): Discord channel to report.
+            _ (list(str)): ignored arguments.
         """
-        s = await self._repr_queries()
-        chop = await chop_str(str(self.cfg['known_papers']))
+        s = self._repr_queries()
+        chop = '[' + chop_join(map(str, self.cfg['known_papers']), 1022) + ']'
         s += f"**Known papers ({len(self.cfg['known_papers'])}):**\n> {chop}"
         await channel.send(s)
 
-    async def _repr_queries(self):
+    def _repr_queries(self):
         """Returns a string representation of the search list."""
         s = '**Search queries:**\n'
-        for category, query in self.cfg['search'].items():
-            s += f"> {category}: {query}\n"
-        return await chop_str(s, remove_whitespace=False)
+        lines = (f"> {category}: {query}\n"
+                 for category, query in self.cfg['search'].items())
+        return s + chop_join(lines, 1024 - len(s), sep='')
 
-    async def _repr_parameters(self, ):
+    def _repr_parameters(self):
         """Returns a string representation of configuration parameters."""
         s = '**Configuration:**\n'
         for param, value in self.cfg.items():
@@ -416,8 +664,8 @@ class arΧivBot(dc.Client):
             + "!arxiv set <key:required> <value:required>\n" \
             + "!arxiv list\n" \
             + "!arxiv help```"
-        s += await self._repr_queries()
-        s += await self._repr_parameters()
+        s += self._repr_queries()
+        s += self._repr_parameters()
         emb = dc.Embed(title="arXiv Discord bot",
                        description=s,
                        type="rich",